@@ -4,7 +4,7 @@ import asyncio
 import asyncssh
 import logging
 import os
-from terminal.otel_tracing import traced_async_class
+from terminal.otel_tracing import no_trace, traced_async_class
 
 logger = logging.getLogger(__name__)
 
@@ -17,24 +17,45 @@ USERNAME: str = os.getenv("AWS_USERNAME", default="xxxx")
 KEY_PATH: str = os.path.join(os.path.dirname(__file__), "aws.pem")
 PORT: int = 22
 
+# Parse the private key once instead of on every connection. Fall back to the
+# path (and let asyncssh report the problem at connect time) if it can't be
+# loaded yet.
+try:
+    CLIENT_KEY = asyncssh.read_private_key(KEY_PATH)
+except (OSError, asyncssh.KeyImportError) as e:
+    logger.warning("Could not preload SSH key %s: %s", KEY_PATH, e)
+    CLIENT_KEY = KEY_PATH
+
+# Bytes requested from the SSH channel per read.
+READ_SIZE: int = 65536
+# Upper bound on a single outbound websocket frame, to bound latency.
+MAX_FLUSH_SIZE: int = 262144
+# Buffered output above which SSH reads pause until the client catches up,
+# so a slow browser still holds back the remote end.
+HIGH_WATER_MARK: int = 4 * MAX_FLUSH_SIZE
+# Number of stdin writes allowed between flow-control drains.
+DRAIN_EVERY: int = 16
+
+# Fixed status messages, serialized once.
+CONNECTING_MESSAGE: str = json.dumps(
+    {"message": "WebSocket connected. Starting EC2 session..."}
+)
+CONNECTED_MESSAGE: str = json.dumps({"message": f"Connected to {HOSTNAME}"})
+
 
 @traced_async_class
 class TerminalConsumer(AsyncWebsocketConsumer):
     async def connect(self):
-        logger.info(f"WebSocket connect: id={id(self)}")
+        logger.info("WebSocket connect: id=%s", id(self))
         await self.accept()
-        await self.send(
-            text_data=json.dumps(
-                {"message": "WebSocket connected. Starting EC2 session..."}
-            )
-        )
+        await self.send(text_data=CONNECTING_MESSAGE)
         self.ssh_task = asyncio.create_task(self.ssh_to_ec2())
         self.process = None
         self.conn = None
-        self.first_time = False
+        self._pending_writes = 0
 
     async def disconnect(self, close_code):
-        logger.info(f"WebSocket disconnect: id={id(self)}, code={close_code}")
+        logger.info("WebSocket disconnect: id=%s, code=%s", id(self), close_code)
         if hasattr(self, "ssh_task"):
             self.ssh_task.cancel()
         if self.process:
@@ -42,54 +63,128 @@ class TerminalConsumer(AsyncWebsocketConsumer):
         if self.conn:
             self.conn.close()
 
+    @no_trace
     async def receive(self, text_data=None, bytes_data=None):
-        if bytes_data is not None:
-            print(f"BYTES RECEIVED: {bytes_data!r}")
-        if text_data is not None:
-            print(f"TEXT RECEIVED: {text_data!r}")
+        if logger.isEnabledFor(logging.DEBUG):
+            if bytes_data is not None:
+                logger.debug("WebSocket received: %d bytes", len(bytes_data))
+            elif text_data is not None:
+                logger.debug("WebSocket received: %d chars", len(text_data))
         if self.process:
-            # make new line for the first time
-            if not self.first_time:
-                self.process.stdin.write("\n")
-                self.first_time = True
-
             if bytes_data is not None:
-                self.process.stdin.write(bytes_data.decode("utf-8", errors="ignore"))
+                self.process.stdin.write(bytes_data)
             elif text_data is not None:
-                self.process.stdin.write(text_data)
-            await self.process.stdin.drain()
+                self.process.stdin.write(text_data.encode("utf-8"))
+            else:
+                return
+            # Writes are buffered by asyncssh; only wait on flow control
+            # every few messages so pastes don't pay a drain per keystroke.
+            self._pending_writes += 1
+            if self._pending_writes >= DRAIN_EVERY:
+                self._pending_writes = 0
+                await self.process.stdin.drain()
 
     async def ssh_to_ec2(self):
         try:
             logger.info(
-                f"Connecting to EC2: {USERNAME}@{HOSTNAME}:{PORT} with key {KEY_PATH}"
+                "Connecting to EC2: %s@%s:%s with key %s",
+                USERNAME,
+                HOSTNAME,
+                PORT,
+                KEY_PATH,
             )
             self.conn = await asyncssh.connect(
                 HOSTNAME,
                 username=USERNAME,
-                client_keys=[KEY_PATH],
+                client_keys=[CLIENT_KEY],
                 port=PORT,
                 known_hosts=None,
             )
             self.process = await self.conn.create_process(
                 term_type="vt100",
                 term_size=(80, 24),
+                encoding=None,
             )
-            await self.send(
-                text_data=json.dumps({"message": f"Connected to {HOSTNAME}"})
-            )
-            logger.info(f"SSH session established to {HOSTNAME}")
+            await self.send(text_data=CONNECTED_MESSAGE)
+            logger.info("SSH session established to %s", HOSTNAME)
+            self._output = bytearray()
+            self._output_ready = asyncio.Event()
+            self._output_drained = asyncio.Event()
+            self._output_closed = False
+            self._flush_task = asyncio.create_task(self.flush_output())
             while not self.process.stdout.at_eof():
-                data = await self.process.stdout.read(4096)
+                # Stop reading if the flusher died (e.g. send() raised);
+                # awaiting it below re-raises its error.
+                if self._flush_task.done():
+                    break
+                data = await self.process.stdout.read(READ_SIZE)
                 if data:
-                    logger.debug(f"EC2 output: {data}")
-                    await self.send(bytes_data=data.encode("utf-8"))
+                    logger.debug("EC2 output: %r", data)
+                    self._output += data
+                    self._output_ready.set()
+                    if len(self._output) > HIGH_WATER_MARK:
+                        await self._wait_for_drain()
+            self._output_closed = True
+            self._output_ready.set()
+            await self._flush_task
         except Exception as e:
-            logger.error(f"SSH error: {str(e)}")
+            logger.error("SSH error: %s", e)
             await self.send(text_data=json.dumps({"message": f"SSH error: {str(e)}"}))
         finally:
+            flush_task = getattr(self, "_flush_task", None)
+            if flush_task and not flush_task.done():
+                flush_task.cancel()
             if self.process:
                 self.process.terminate()
             if self.conn:
                 self.conn.close()
             logger.info("SSH session closed")
+
+    @no_trace
+    async def _wait_for_drain(self):
+        """
+        Block the reader until the flusher brings the buffer back under
+        HIGH_WATER_MARK, or until the flusher stops (e.g. send() raised) so
+        the reader never waits on an event nobody will set.
+        """
+        self._output_drained.clear()
+        drained = asyncio.ensure_future(self._output_drained.wait())
+        try:
+            await asyncio.wait(
+                {drained, self._flush_task},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            drained.cancel()
+
+    async def flush_output(self):
+        """
+        Forward buffered SSH output to the client. Everything read since the
+        last wakeup goes out as one frame (capped at MAX_FLUSH_SIZE), so
+        chatty output costs one send per batch instead of one per read.
+        Wakes the reader once the buffer is back under HIGH_WATER_MARK.
+        """
+        try:
+            while True:
+                await self._output_ready.wait()
+                # One cooperative yield before building the frame: if the
+                # reader task is scheduled in that tick, the output it reads
+                # joins this batch. No syscall-level coalescing is done.
+                await asyncio.sleep(0)
+                self._output_ready.clear()
+                while self._output:
+                    if len(self._output) <= MAX_FLUSH_SIZE:
+                        # Common case: copy the whole buffer once, no slicing.
+                        chunk = bytes(self._output)
+                        self._output.clear()
+                    else:
+                        chunk = bytes(self._output[:MAX_FLUSH_SIZE])
+                        del self._output[:MAX_FLUSH_SIZE]
+                    await self.send(bytes_data=chunk)
+                    if len(self._output) <= HIGH_WATER_MARK:
+                        self._output_drained.set()
+                if self._output_closed:
+                    return
+        finally:
+            # Never leave the reader waiting on a flusher that has stopped.
+            self._output_drained.set()
@@ -1,14 +1,26 @@
+from opentelemetry import trace
+from opentelemetry.propagators.textmap import Setter
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
 
 
+class _TraceparentSetter(Setter):
+    """Write only the traceparent field straight onto the response headers."""
+
+    def set(self, carrier, key, value):
+        if key == "traceparent":
+            carrier["Traceparent"] = value
+
+
+_PROPAGATOR = TraceContextTextMapPropagator()
+_SETTER = _TraceparentSetter()
+
+
 class TraceparentHeaderMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         response = self.get_response(request)
-        carrier = {}
-        TraceContextTextMapPropagator().inject(carrier)
-        if "traceparent" in carrier:
-            response["Traceparent"] = carrier["traceparent"]
+        if trace.get_current_span().get_span_context().is_valid:
+            _PROPAGATOR.inject(response, setter=_SETTER)
         return response
@@ -1,70 +1,59 @@
 """
 OpenTelemetry enhancements for Redis in Django projects.
 
-- CustomRedisSpanProcessor: Adds global attributes and events to all Redis spans,
-  including caller info if available. Handles errors gracefully.
-- Monkey-patches Django cache methods (get, set, delete) to automatically enrich
-  the current span with caller function, file, and line number.
+- CustomRedisSpanProcessor: Adds a global attribute to all Redis spans when they
+  start. Handles errors gracefully.
+- Monkey-patches Django cache methods (get, set, delete) to enrich a sample
+  (CALLER_SAMPLE_RATE) of recording spans with caller function, file, and line
+  number.
 - setup_redis_otel(provider): Registers the span processor and applies the cache
   patch. Call this from your Django settings after setting up the OTEL provider.
 
-Note: The span processor identifies Redis spans by checking for the standard
-OpenTelemetry attribute 'db.system' == 'redis', which is set automatically by
-opentelemetry-instrumentation-redis according to the OpenTelemetry semantic
-conventions for databases.
+Note: The span processor identifies Redis spans by their instrumentation scope
+(REDIS_INSTRUMENTATION_SCOPE). The standard 'db.system' == 'redis' attribute
+is only set by opentelemetry-instrumentation-redis after the span has started,
+and ended spans are read-only, so it cannot be used to tag spans.
 """
 
-import inspect
+import random
+import sys
 from django.core.cache import cache
 from opentelemetry import trace
 from opentelemetry.sdk.trace import SpanProcessor
 
+# Fraction of cache calls whose span gets caller info. Walking the stack on
+# every call costs more than the Redis round-trip itself.
+CALLER_SAMPLE_RATE = 0.01
+
+# Instrumentation scope of the spans created by opentelemetry-instrumentation-redis.
+# The instrumentation only sets 'db.system' after the span has started, so
+# on_start identifies Redis spans by their scope instead.
+REDIS_INSTRUMENTATION_SCOPE = "opentelemetry.instrumentation.redis"
+
 
 # --- Span Processor for all Redis spans ---
 class CustomRedisSpanProcessor(SpanProcessor):
     """
-    OpenTelemetry SpanProcessor that enriches all Redis spans with global
-    attributes, caller info (if available), and custom events. Handles errors
-    gracefully.
+    OpenTelemetry SpanProcessor that tags all Redis spans with a global
+    attribute. Handles errors gracefully.
 
-    Only processes spans where span.attributes['db.system'] == 'redis', as set
-    by the OpenTelemetry Redis instrumentation according to the semantic
-    conventions.
+    Tagging happens in on_start: spans passed to on_end are read-only, so they
+    can no longer take attributes or events. Redis errors are already recorded
+    on the span (exception event and ERROR status) by the instrumentation.
     """
 
-    def on_start(self, span, parent_context):
-        pass
-
-    def on_end(self, span):
+    def on_start(self, span, parent_context=None):
         """
-        Enrich Redis spans with custom attributes and events. If an error occurs
+        Tag spans created by the Redis instrumentation. If an error occurs
         during enrichment, record it as a span attribute.
         """
-        if span.attributes.get("db.system") == "redis":
+        scope = span.instrumentation_scope
+        if scope is not None and scope.name == REDIS_INSTRUMENTATION_SCOPE:
             try:
                 span.set_attribute(
                     "custom.global_redis_tag",
                     "django-aws-terminal-websocket",
                 )
-                statement = span.attributes.get("db.statement")
-                args_length = span.attributes.get("db.redis.args_length")
-                key = span.attributes.get("db.redis.key", "unknown")
-                caller_func = span.attributes.get("custom.redis.caller_function")
-                caller_file = span.attributes.get("custom.redis.caller_file")
-                caller_line = span.attributes.get("custom.redis.caller_line")
-                span.add_event(
-                    "Global Redis operation",
-                    {
-                        "statement": statement,
-                        "args_length": args_length,
-                        "key": key,
-                        "caller_function": caller_func,
-                        "caller_file": caller_file,
-                        "caller_line": caller_line,
-                    },
-                )
-                if getattr(span.status, "status_code", None) != 1:  # 1 = OK
-                    span.set_attribute("custom.redis_error", "Error in Redis operation")
             except Exception as e:
                 span.set_attribute("custom.redis_spanprocessor_error", str(e))
 
@@ -75,25 +64,31 @@ def enrich_span_with_caller(span):
     Enrich the current span with the caller's function, file, and line number.
     Used by the cache method monkey-patch.
     """
-    frame = inspect.currentframe()
-    if frame is not None:
-        outer = frame.f_back.f_back
-        if outer is not None:
-            span.set_attribute("custom.redis.caller_function", outer.f_code.co_name)
-            span.set_attribute("custom.redis.caller_file", outer.f_code.co_filename)
-            span.set_attribute("custom.redis.caller_line", outer.f_lineno)
+    try:
+        outer = sys._getframe(2)
+    except ValueError:
+        return
+    span.set_attributes(
+        {
+            "custom.redis.caller_function": outer.f_code.co_name,
+            "custom.redis.caller_file": outer.f_code.co_filename,
+            "custom.redis.caller_line": outer.f_lineno,
+        }
+    )
 
 
 def patch_cache_method(method_name):
     """
-    Monkey-patch a Django cache method to enrich the span with caller info.
+    Monkey-patch a Django cache method to enrich a sample of spans with
+    caller info.
     """
     orig = getattr(cache, method_name)
 
     def wrapper(*args, **kwargs):
-        span = trace.get_current_span()
-        if span and span.is_recording():
-            enrich_span_with_caller(span)
+        if random.random() < CALLER_SAMPLE_RATE:
+            span = trace.get_current_span()
+            if span.is_recording():
+                enrich_span_with_caller(span)
         return orig(*args, **kwargs)
 
     setattr(cache, method_name, wrapper)
@@ -113,9 +108,8 @@ def setup_redis_otel(provider):
     Register the custom Redis span processor and patch Django cache methods.
     Call this from your Django settings after setting up the OTEL provider.
 
-    The span processor identifies Redis spans by checking for the standard
-    OpenTelemetry attribute 'db.system' == 'redis', which is set automatically
-    by the opentelemetry-instrumentation-redis package.
+    The span processor identifies Redis spans by the instrumentation scope of
+    the opentelemetry-instrumentation-redis package.
     """
     provider.add_span_processor(CustomRedisSpanProcessor())
     patch_cache()
@@ -7,6 +7,7 @@ Provides:
   code setting, and error recording for sync and async functions/methods.
 - traced_class and traced_async_class for automatic tracing of all sync or async
   methods in a class, respectively.
+- no_trace to exclude a high-frequency method from the class decorators.
 """
 
 from typing import Type
@@ -42,10 +43,96 @@ def _get_span_name(func, args, span_name):
     return func.__name__
 
 
+def _code_attributes(func, span_name):
+    """
+    Build the code.* span attributes for a function once, at decoration time.
+    They are passed to the span in a single call instead of one set_attribute
+    per key.
+
+    Args:
+        func: The function or method being decorated.
+        span_name: Optional custom span name, used as code.function if set.
+
+    Returns:
+        dict: The attributes shared by every span of this function.
+    """
+    return {
+        "code.filepath": func.__code__.co_filename,
+        "code.lineno": func.__code__.co_firstlineno,
+        "code.function": span_name or func.__name__,
+        "code.namespace": func.__module__,
+    }
+
+
+def _runtime_span_attributes(func, args, code_attributes, per_class):
+    """
+    Return the span name and attributes for a call without a custom span
+    name. The name depends on the runtime class of args[0] (see
+    _get_span_name), so the pair is built once per class and then reused.
+
+    Args:
+        func: The function or method being decorated.
+        args: The positional arguments passed to the function.
+        code_attributes: The attributes built by _code_attributes.
+        per_class (dict): Cache of (name, attributes) keyed by runtime class.
+
+    Returns:
+        tuple: The span name and the attributes dict for the span.
+    """
+    key = type(args[0]) if args else None
+    cached = per_class.get(key)
+    if cached is None:
+        name = _get_span_name(func, args, None)
+        cached = per_class[key] = (name, {**code_attributes, "code.function": name})
+    return cached
+
+
+def _should_trace(ctx):
+    """
+    Cheaply decide whether a new span could end up being recorded, so the
+    decorators can skip span creation entirely when it would be dropped.
+
+    Tracing is skipped when no SDK tracer provider has been installed, or when
+    the parent span exists but was not sampled (the default ParentBased
+    sampler would drop the child anyway).
+
+    Args:
+        ctx: The context the span would be started in.
+
+    Returns:
+        bool: True if a span should be started.
+    """
+    if isinstance(
+        trace.get_tracer_provider(),
+        (trace.ProxyTracerProvider, trace.NoOpTracerProvider),
+    ):
+        return False
+    parent = trace.get_current_span(ctx).get_span_context()
+    return not parent.is_valid or parent.trace_flags.sampled
+
+
+def no_trace(func):
+    """
+    Mark a method so traced_class/traced_async_class leave it unwrapped.
+    Use it for hot methods (e.g. per-message handlers) where a span per call
+    costs more than the work being traced.
+
+    Usage:
+        @traced_async_class
+        class MyConsumer:
+            @no_trace
+            async def receive(self, text_data=None, bytes_data=None):
+                ...
+    """
+    func._no_trace = True
+    return func
+
+
 def traced_function(span_name=None):
     """
     Decorator to trace a synchronous function with OpenTelemetry.
     Creates a span, sets code attributes, status, and records exceptions.
+    No span is created when it would not be sampled (see _should_trace).
 
     Args:
         span_name (str, optional): Custom span name. Defaults to None.
@@ -58,6 +145,9 @@ def traced_function(span_name=None):
         """
         Decorator function that wraps the original function with tracing logic.
         """
+        code_attributes = _code_attributes(func, span_name)
+        # (span name, attributes) per runtime class, when no span_name is set.
+        per_class = {}
 
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -72,22 +162,23 @@ def traced_function(span_name=None):
             Returns:
                 Any: The result of the wrapped function.
             """
-            name = _get_span_name(func, args, span_name)
-            module = func.__module__
             # Allow manual context override
             ctx = kwargs.pop("context", None)
             if ctx is None:
                 ctx = otel_context.get_current()
-            with tracer.start_as_current_span(name, context=ctx) as span:
-                span.set_attribute("code.filepath", func.__code__.co_filename)
-                span.set_attribute("code.lineno", func.__code__.co_firstlineno)
-                span.set_attribute("code.function", name)
-                span.set_attribute("code.namespace", module)
-                span.set_attribute("args", str(args))
-                span.set_attribute("kwargs", str(kwargs))
+            if not _should_trace(ctx):
+                return func(*args, **kwargs)
+            if span_name:
+                name, attributes = span_name, code_attributes
+            else:
+                name, attributes = _runtime_span_attributes(
+                    func, args, code_attributes, per_class
+                )
+            with tracer.start_as_current_span(
+                name, context=ctx, attributes=attributes
+            ) as span:
                 try:
                     result = func(*args, **kwargs)
-                    span.set_attribute("return_type", str(type(result)))
                     span.set_status(Status(StatusCode.OK))
                     return result
                 except Exception as e:
@@ -106,12 +197,12 @@ def traced_class(cls: Type) -> Type:
     Class decorator to automatically apply traced_function to all synchronous
     (non-async) methods.
 
-    - Excludes dunder methods and static/class methods.
-    - Each sync method will be traced with a span named after the class and
-      method.
+    - Excludes dunder methods, static/class methods, and methods marked with
+      no_trace.
+    - Each sync method will be traced with a span named after the instance's
+      class and the method, so subclasses get their own span names.
     - Exceptions are recorded and span status is set to ERROR if any occur.
-    - Span attributes include file, line, function, args, kwargs, and return
-      type.
+    - Span attributes include file, line, function, and namespace.
 
     Usage:
         @traced_class
@@ -124,6 +215,7 @@ def traced_class(cls: Type) -> Type:
             inspect.isfunction(attr)
             and not inspect.iscoroutinefunction(attr)
             and not name.startswith("__")
+            and not getattr(attr, "_no_trace", False)
         ):
             setattr(cls, name, traced_function()(attr))
     return cls
@@ -132,9 +224,14 @@ def traced_class(cls: Type) -> Type:
 def traced_async_class(cls: Type) -> Type:
     """
     Class decorator to automatically apply traced_async_function to all async methods.
+    Dunder methods and methods marked with no_trace are left unwrapped.
     """
     for name, attr in cls.__dict__.items():
-        if inspect.iscoroutinefunction(attr) and not name.startswith("__"):
+        if (
+            inspect.iscoroutinefunction(attr)
+            and not name.startswith("__")
+            and not getattr(attr, "_no_trace", False)
+        ):
             setattr(cls, name, traced_async_function()(attr))
     return cls
 
@@ -143,6 +240,7 @@ def traced_async_function(span_name=None):
     """
     Decorator to trace an async function with OpenTelemetry.
     Creates a span, sets code attributes, status, and records exceptions.
+    No span is created when it would not be sampled (see _should_trace).
 
     Args:
         span_name (str, optional): Custom span name. Defaults to None.
@@ -156,6 +254,9 @@ def traced_async_function(span_name=None):
         Decorator function that wraps the original async function with tracing
         logic.
         """
+        code_attributes = _code_attributes(func, span_name)
+        # (span name, attributes) per runtime class, when no span_name is set.
+        per_class = {}
 
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -170,21 +271,23 @@ def traced_async_function(span_name=None):
             Returns:
                 Any: The result of the wrapped async function.
             """
-            name = _get_span_name(func, args, span_name)
-            module = func.__module__
+            # Allow manual context override
             ctx = kwargs.pop("context", None)
             if ctx is None:
                 ctx = otel_context.get_current()
-            with tracer.start_as_current_span(name, context=ctx) as span:
-                span.set_attribute("code.filepath", func.__code__.co_filename)
-                span.set_attribute("code.lineno", func.__code__.co_firstlineno)
-                span.set_attribute("code.function", name)
-                span.set_attribute("code.namespace", module)
-                span.set_attribute("args", str(args))
-                span.set_attribute("kwargs", str(kwargs))
+            if not _should_trace(ctx):
+                return await func(*args, **kwargs)
+            if span_name:
+                name, attributes = span_name, code_attributes
+            else:
+                name, attributes = _runtime_span_attributes(
+                    func, args, code_attributes, per_class
+                )
+            with tracer.start_as_current_span(
+                name, context=ctx, attributes=attributes
+            ) as span:
                 try:
                     result = await func(*args, **kwargs)
-                    span.set_attribute("return_type", str(type(result)))
                     span.set_status(Status(StatusCode.OK))
                     return result
                 except Exception as e:
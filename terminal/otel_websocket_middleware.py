@@ -9,6 +9,88 @@ from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapProp
 from opentelemetry.trace.status import Status, StatusCode
 
 tracer = trace.get_tracer(__name__)
+_PROPAGATOR = TraceContextTextMapPropagator()
+
+
+_JSON_WHITESPACE = " \t\n\r"
+
+
+def _inject_traceparent(text, traceparent):
+    """
+    Add a "traceparent" field to a JSON object payload. The field is spliced
+    in before the closing brace without decoding the payload; only payloads
+    that already carry a traceparent go through json so the key is replaced
+    rather than duplicated. Text that does not look like a JSON object is
+    returned unchanged.
+    :param text: The outbound text payload.
+    :param traceparent: The W3C traceparent value to embed.
+    :return: The payload with the traceparent field set, or the original text.
+    """
+    if '"traceparent"' in text:
+        try:
+            msg = json.loads(text)
+        except ValueError:
+            return text
+        if not isinstance(msg, dict):
+            return text
+        msg["traceparent"] = traceparent
+        return json.dumps(msg)
+    # Find the first and last non-whitespace characters inside the braces by
+    # scanning, so the check does not copy the payload.
+    end = len(text) - 1
+    while end > 0 and text[end] in _JSON_WHITESPACE:
+        end -= 1
+    if end < 1 or text[0] != "{" or text[end] != "}":
+        return text
+    start = 1
+    while start < end and text[start] in _JSON_WHITESPACE:
+        start += 1
+    # A JSON object is either empty or starts with a string key.
+    if start == end:
+        separator = ""
+    elif text[start] == '"':
+        separator = ","
+    else:
+        return text
+    return "".join(
+        (text[:end], separator, '"traceparent":"', traceparent, '"', text[end:])
+    )
+
+
+# First-message types that get their own span, linked to the connection trace.
+_LIFECYCLE_EVENTS = frozenset(
+    ("websocket.accept", "websocket.disconnect", "websocket.close")
+)
+
+
+def _trace_lifecycle_event(message, ctx):
+    """
+    Record a span for a websocket.accept, websocket.disconnect or
+    websocket.close message.
+    :param message: The ASGI message; its type is used as the span name.
+    :param ctx: The connection's OpenTelemetry context.
+    """
+    with tracer.start_as_current_span(message["type"], context=ctx) as span:
+        if message["type"] == "websocket.disconnect":
+            span.set_attribute("ws.code", message.get("code"))
+        span.set_status(Status(StatusCode.OK))
+
+
+def _extract_context(message, scope):
+    """
+    Extract a trace context from a text message carrying a "traceparent" field
+    and store it in the scope as the connection's context.
+    :param message: The first ASGI message received on the connection.
+    :param scope: The ASGI scope dictionary.
+    """
+    if message.get("type") == "websocket.receive" and message.get("text"):
+        try:
+            msg = json.loads(message["text"])
+            if isinstance(msg, dict) and "traceparent" in msg:
+                carrier = {"traceparent": msg["traceparent"]}
+                scope["otel_context"] = _PROPAGATOR.extract(carrier)
+        except Exception:
+            pass
 
 
 class OpenTelemetryWebSocketMiddleware:
@@ -39,103 +121,61 @@ class OpenTelemetryWebSocketMiddleware:
     async def __call__(self, scope, receive, send):
         """
         ASGI entrypoint. Handles context extraction, span creation, and error recording
-        for all WebSocket events in the connection lifecycle.
+        for all WebSocket events in the connection lifecycle. Non-WebSocket scopes
+        are passed straight through to the wrapped app.
         :param scope: The ASGI scope dictionary.
         :param receive: The ASGI receive callable.
         :param send: The ASGI send callable.
         """
+        if scope["type"] != "websocket":
+            return await self.app(scope, receive, send)
+
         # If this is a connect event, create a root span and store its context
-        if scope["type"] == "websocket":
-            if not scope.get("otel_context"):
-                with tracer.start_as_current_span("websocket.connect") as span:
-                    ctx = trace.set_span_in_context(span)
-                    scope["otel_context"] = ctx
-                    span.set_status(
-                        Status(
-                            StatusCode.OK, "WebSocket connect completed successfully"
-                        )
-                    )
+        if not scope.get("otel_context"):
+            with tracer.start_as_current_span("websocket.connect") as span:
+                ctx = trace.set_span_in_context(span)
+                scope["otel_context"] = ctx
+                span.set_status(
+                    Status(StatusCode.OK, "WebSocket connect completed successfully")
+                )
 
-        extracted_context = None
-        first_message = None
-        first_message_ready = False
-
-        async def otel_receive():
-            nonlocal extracted_context, first_message, first_message_ready
-            if not first_message_ready:
-                # Prime the first message
-                first_message = await receive()
-                first_message_ready = True
-                # Extract context for text WebSocket messages
-                if first_message.get(
-                    "type"
-                ) == "websocket.receive" and first_message.get("text"):
-                    try:
-                        msg = json.loads(first_message["text"])
-                        if isinstance(msg, dict) and "traceparent" in msg:
-                            carrier = {"traceparent": msg["traceparent"]}
-                            extracted_context = TraceContextTextMapPropagator().extract(
-                                carrier
-                            )
-                            scope["otel_context"] = extracted_context
-                    except Exception:
-                        pass
-                # Trace websocket.accept, disconnect, close events
-                ctx = scope.get("otel_context")
-                if first_message.get("type") == "websocket.accept":
-                    with tracer.start_as_current_span(
-                        "websocket.accept", context=ctx
-                    ) as span:
-                        span.set_status(Status(StatusCode.OK))
-                elif first_message.get("type") == "websocket.disconnect":
-                    with tracer.start_as_current_span(
-                        "websocket.disconnect", context=ctx
-                    ) as span:
-                        span.set_attribute("ws.code", first_message.get("code"))
-                        span.set_status(Status(StatusCode.OK))
-                elif first_message.get("type") == "websocket.close":
-                    with tracer.start_as_current_span(
-                        "websocket.close", context=ctx
-                    ) as span:
-                        span.set_status(Status(StatusCode.OK))
-                return first_message
-            else:
-                message = await receive()
-                # Trace websocket.accept, disconnect, close events
-                ctx = scope.get("otel_context")
-                if message.get("type") == "websocket.accept":
-                    with tracer.start_as_current_span(
-                        "websocket.accept", context=ctx
-                    ) as span:
-                        span.set_status(Status(StatusCode.OK))
-                elif message.get("type") == "websocket.disconnect":
-                    with tracer.start_as_current_span(
-                        "websocket.disconnect", context=ctx
-                    ) as span:
-                        span.set_attribute("ws.code", message.get("code"))
-                        span.set_status(Status(StatusCode.OK))
-                elif message.get("type") == "websocket.close":
-                    with tracer.start_as_current_span(
-                        "websocket.close", context=ctx
-                    ) as span:
-                        span.set_status(Status(StatusCode.OK))
+        async def receive_with_first():
+            # Hand the primed first message to the app once; everything after
+            # it is passed straight through from the server.
+            nonlocal first_message
+            if first_message is not None:
+                message, first_message = first_message, None
                 return message
+            return await receive()
+
+        injected_context = None
 
         async def otel_send(message):
-            if message.get("type") == "websocket.send" and message.get("text"):
-                try:
-                    msg = json.loads(message["text"])
+            nonlocal injected_context
+            text = None
+            if message.get("type") == "websocket.send":
+                text = message.get("text")
+            if text and text[0] == "{":
+                span_context = trace.get_current_span().get_span_context()
+                # Only the first JSON frame sent under each span context
+                # carries the traceparent.
+                if span_context.is_valid and span_context != injected_context:
                     carrier = {}
-                    TraceContextTextMapPropagator().inject(carrier)
-                    if "traceparent" in carrier:
-                        msg["traceparent"] = carrier["traceparent"]
-                        message["text"] = json.dumps(msg)
-                except Exception:
-                    pass
+                    _PROPAGATOR.inject(carrier)
+                    traceparent = carrier.get("traceparent")
+                    if traceparent:
+                        injected = _inject_traceparent(text, traceparent)
+                        if injected is not text:
+                            message["text"] = injected
+                            injected_context = span_context
             await send(message)
 
-        # Prime the first message and extract context
-        await otel_receive()
+        # Prime the first message and extract context; it is handed to the
+        # app on its first receive() call by receive_with_first.
+        first_message = await receive()
+        _extract_context(first_message, scope)
+        if first_message.get("type") in _LIFECYCLE_EVENTS:
+            _trace_lifecycle_event(first_message, scope.get("otel_context"))
         # Use the context from the scope (set by connect or receive)
         ctx = scope.get("otel_context")
         token = None
@@ -145,15 +185,6 @@ class OpenTelemetryWebSocketMiddleware:
             with tracer.start_as_current_span(
                 "websocket.session", context=ctx
             ) as session_span:
-                first = True
-
-                async def receive_with_first():
-                    nonlocal first, first_message, first_message_ready
-                    if first and first_message_ready:
-                        first = False
-                        return first_message
-                    return await receive()
-
                 try:
                     await self.app(scope, receive_with_first, otel_send)
                     session_span.set_status(
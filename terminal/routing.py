@@ -1,9 +1,9 @@
-from django.urls import re_path, path
+from django.urls import path
 from . import consumers
 from terminal.views import health_check_view
 
 websocket_urlpatterns = [
-    re_path(r"ws/terminal/$", consumers.TerminalConsumer.as_asgi()),
+    path("ws/terminal/", consumers.TerminalConsumer.as_asgi()),
 ]
 
 urlpatterns = [
@@ -1,18 +1,24 @@
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from celery import shared_task
 from django.conf import settings
 from terminal.otel_tracing import traced_function
 
 logger = logging.getLogger(__name__)
 
+# Reused across task runs so the health check keeps its connection alive.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 
 @shared_task
 @traced_function()
 def health_check_task():
     url = settings.HEALTH_CHECK_URL
     try:
-        response = requests.get(url, timeout=10)
+        response = _SESSION.get(url, timeout=10)
         logger.info(
             f"Health check status: {response.status_code}, body: {response.text}"
         )